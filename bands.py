@@ -0,0 +1,60 @@
+"""
+Population-band aggregation through prefix sums.
+
+Cumulative sums of contributors, RTB and tax are kept per (year, region),
+ordered by x position. The centil at x position x covers the population
+band that ends at x% (centil 1: 0-1%, 99.1: 99-99.1%, 100: 99.99-100%), so
+the total of any band (start%, end%] is one subtraction of prefix sums, for
+every group at once. Band edges that fall inside a centil are rounded down
+to the centil edge below them, e.g. band(99.05, 99.15) covers (99%, 99.1%].
+"""
+import numpy as np
+import pandas as pd
+
+from utils import QUANTIDADE, SOMA_RTB, IMPOSTO_DEVIDO, pivot_groups
+
+COLUMNS = [QUANTIDADE, SOMA_RTB, IMPOSTO_DEVIDO]
+
+# Tolerance for band edges that fall on an x position
+EDGE_TOLERANCE = 1e-6
+
+DECILES = [(start, start + 10) for start in range(0, 100, 10)]
+QUINTILES = [(start, start + 20) for start in range(0, 100, 20)]
+
+class CentilPrefixSums:
+    def __init__(self, df):
+        self.groups, self.positions, arrays = pivot_groups(df, COLUMNS)
+        zeros = np.zeros((len(self.groups), 1))
+        self.prefix = {column: np.concatenate([zeros, np.cumsum(arrays[column], axis=1)], axis=1)
+                       for column in COLUMNS}
+
+    def _edge(self, percent):
+        # Number of centils whose band ends at or before percent
+        return np.searchsorted(self.positions, percent + EDGE_TOLERANCE, side='right')
+
+    def band(self, start, end):
+        """Totals and tax rate of the population band (start%, end%] for every group"""
+        low, high = self._edge(start), self._edge(end)
+
+        totals = self.groups.copy()
+        for column in COLUMNS:
+            totals[column] = self.prefix[column][:, high] - self.prefix[column][:, low]
+        rtb, total_rtb = totals[SOMA_RTB].to_numpy(), self.prefix[SOMA_RTB][:, -1]
+        totals['Tax_Rate'] = np.divide(totals[IMPOSTO_DEVIDO].to_numpy(), rtb, out=np.zeros(len(rtb)), where=rtb != 0) * 100
+        totals['Share_RTB'] = np.divide(rtb, total_rtb, out=np.zeros(len(rtb)), where=total_rtb != 0) * 100
+        return totals
+
+    def rebin(self, bands):
+        """One row per group and band, for a list of (start%, end%) bands"""
+        tables = []
+        for start, end in bands:
+            table = self.band(start, end)
+            table.insert(len(self.groups.columns), 'Faixa', f"{start:g}-{end:g}%")
+            tables.append(table)
+        return pd.concat(tables, ignore_index=True)
+
+    def deciles(self):
+        return self.rebin(DECILES)
+
+    def quintiles(self):
+        return self.rebin(QUINTILES)
@@ -0,0 +1,65 @@
+"""
+Serialization benchmark for the plot functions: plotly.py's own output for
+figures built from number lists and from NumPy arrays (f8 typed arrays),
+versus figures.figure_to_json.
+
+Usage: python benchmark_figures.py [data/distribuicao-renda.csv]
+"""
+import base64
+import sys
+import time
+
+import numpy as np
+import plotly.graph_objects as go
+
+from centil_index import CentilIndex
+from figures import figure_to_json
+from pipeline import load_centil_table
+from plots import (plot_razao_rendimentos, plot_razao_rendimentos_multiple_years, plot_renda_custom_plotly,
+                   plot_imposto_devido_2020, plot_rendimentos_tributaveis_soma_2020, plot_tax_rate_2020)
+
+REPEAT = 20
+
+def _as_lists(value):
+    # Trace data as plain number lists
+    if isinstance(value, np.ndarray):
+        return value.tolist()
+    if isinstance(value, dict) and set(value) == {"dtype", "bdata"}:
+        return np.frombuffer(base64.b64decode(value["bdata"]), dtype=value["dtype"]).tolist()
+    if isinstance(value, dict):
+        return {key: _as_lists(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_as_lists(item) for item in value]
+    return value
+
+def list_figure(fig):
+    # The same figure built from number lists, which plotly.py writes as lists
+    return go.Figure(_as_lists(fig.to_plotly_json()))
+
+def timed(serialize, fig):
+    start = time.perf_counter()
+    for _ in range(REPEAT):
+        output = serialize(fig)
+    return (time.perf_counter() - start) / REPEAT * 1000, len(output)
+
+def main(path):
+    centis = CentilIndex(load_centil_table(path))
+    figures = {
+        "plot_razao_rendimentos": plot_razao_rendimentos(centis.group(2020)),
+        "plot_razao_rendimentos_multiple_years": plot_razao_rendimentos_multiple_years(centis),
+        "plot_renda_custom_plotly": plot_renda_custom_plotly(centis),
+        "plot_imposto_devido_2020": plot_imposto_devido_2020(centis),
+        "plot_rendimentos_tributaveis_soma_2020": plot_rendimentos_tributaveis_soma_2020(centis),
+        "plot_tax_rate_2020": plot_tax_rate_2020(centis),
+    }
+
+    columns = ["lists", "plotly", "compact"]
+    print(f"{'figure':40}" + "".join(f" {name + ' ms':>10} {name + ' KB':>10}" for name in columns))
+    for name, fig in figures.items():
+        results = [timed(go.Figure.to_json, list_figure(fig)),
+                   timed(go.Figure.to_json, fig),
+                   timed(figure_to_json, fig)]
+        print(f"{name:40}" + "".join(f" {ms:10.2f} {size / 1024:10.1f}" for ms, size in results))
+
+if __name__ == "__main__":
+    main(sys.argv[1] if len(sys.argv) > 1 else "data/distribuicao-renda.csv")
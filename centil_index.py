@@ -0,0 +1,46 @@
+"""
+Keyed access to the processed centil table.
+
+The table is indexed by a sorted (Ano-calendário, Ente Federativo, Centil)
+MultiIndex, so point and range lookups are binary searches instead of boolean
+scans over whole columns. Centil codes sort in the same order as their x
+positions (1..99, 1001..1009, 100101..100110, 1001010), so a range of codes is
+also a contiguous band of the population.
+"""
+from utils import ANO, ENTE, CENTIL, map_x_position
+
+KEYS = [ANO, ENTE, CENTIL]
+
+class CentilIndex:
+    def __init__(self, df, region="BRASIL"):
+        """
+        Index a processed centil table. Tables already filtered to a single
+        region (without 'Ente Federativo') are stored under `region`.
+        """
+        df = df.copy()
+        if ENTE not in df.columns:
+            df[ENTE] = region
+        if 'x_position' not in df.columns:
+            df['x_position'] = df[CENTIL].apply(map_x_position)
+
+        self.region = region
+        self.df = df.set_index(KEYS).sort_index()
+
+    def years(self):
+        return list(self.df.index.get_level_values(ANO).unique())
+
+    def regions(self):
+        return sorted(self.df.index.get_level_values(ENTE).unique())
+
+    def get(self, year, centil, column=None, region=None):
+        """Row (or single value, if column is given) of one centil"""
+        row = self.df.loc[(year, region or self.region, centil)]
+        return row if column is None else row[column]
+
+    def group(self, year, region=None):
+        """All centils of a year/region, indexed by Centil in x position order"""
+        return self.df.loc[(year, region or self.region)]
+
+    def range(self, year, start=None, stop=None, region=None):
+        """Centils from start to stop (codes, both inclusive) of a year/region"""
+        return self.group(year, region).loc[start:stop]
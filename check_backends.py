@@ -0,0 +1,64 @@
+"""
+Parity check between the pandas and DuckDB backends of pipeline.py.
+
+Writes a small fixture in the Receita format, with every number as
+Brazilian-formatted text (including Centil: "1.001", "1.001.010"), and
+checks that both backends give the same processed table and metrics.
+
+Usage: python check_backends.py [data/distribuicao-renda.csv]
+"""
+import os
+import sys
+import tempfile
+
+import pandas as pd
+
+from pipeline import load_centil_table, load_metrics
+from utils import ANO, ENTE, CENTIL, QUANTIDADE, LIMITE_SUPERIOR, SOMA_RTB, IMPOSTO_DEVIDO
+
+CENTILS = list(range(1, 101)) + list(range(1001, 1010)) + [10010] + list(range(100101, 100110)) + [1001010]
+
+def brazilian(value, decimals=2):
+    text = f"{value:,.{decimals}f}"
+    return text.replace(",", "_").replace(".", ",").replace("_", ".")
+
+def write_fixture(path):
+    rows = []
+    for region in ["BRASIL", "SP"]:
+        for year in [2019, 2020]:
+            limite = 0.0
+            for i, centil in enumerate(CENTILS):
+                if centil > 6:
+                    limite = limite + 1000.0 * (1 + i / 10) * (year - 2017)
+                quantidade = 316.349 if centil <= 100 else 31.635
+                soma = limite * quantidade / 1000 * 0.9 if centil > 6 else None
+                imposto = soma * min(0.275, i / 400) if soma is not None else None
+                rows.append({
+                    ANO: year,
+                    ENTE: region,
+                    CENTIL: brazilian(centil, 0),
+                    QUANTIDADE: quantidade,
+                    LIMITE_SUPERIOR: brazilian(limite) if centil > 6 else None,
+                    SOMA_RTB: brazilian(soma) if soma is not None else None,
+                    IMPOSTO_DEVIDO: brazilian(imposto) if imposto is not None else None,
+                })
+    pd.DataFrame(rows).to_csv(path, sep=";", index=False)
+
+def check(path):
+    for region in ["BRASIL", "SP", None]:
+        pandas_table = load_centil_table(path, region, backend="pandas")
+        duckdb_table = load_centil_table(path, region, backend="duckdb")
+        assert list(pandas_table.columns) == list(duckdb_table.columns)
+        pd.testing.assert_frame_equal(pandas_table, duckdb_table, check_dtype=False)
+        pd.testing.assert_frame_equal(load_metrics(path, region, backend="pandas"),
+                                      load_metrics(path, region, backend="duckdb"), check_dtype=False)
+        print(f"{path} ({region or 'todos os entes'}): {len(pandas_table)} linhas iguais")
+
+if __name__ == "__main__":
+    if len(sys.argv) > 1:
+        check(sys.argv[1])
+    else:
+        with tempfile.TemporaryDirectory() as directory:
+            fixture = os.path.join(directory, "distribuicao-renda.csv")
+            write_fixture(fixture)
+            check(fixture)
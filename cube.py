@@ -0,0 +1,111 @@
+"""
+Dense (year x region x centil x metric) cube of the processed centil table.
+
+The table is small and fixed-shape, so it is also stored as one float64
+NumPy array on disk (cube.npy), with the axis labels in cube_labels.json.
+Opening it memory-maps the array: startup reads only the labels, and
+selections such as "all years for centil 99 in SP" are plain array views.
+Missing (year, region, centil) cells are NaN.
+
+MetricCube has the same accessors as CentilIndex (years, regions, get,
+group, range), so the plot functions take either one.
+"""
+import json
+import os
+
+import numpy as np
+import pandas as pd
+
+from utils import ANO, ENTE, CENTIL, map_x_position, map_width
+
+KEYS = [ANO, ENTE, CENTIL]
+
+# Derived from the centil code when the cube is opened
+DERIVED = ['x_position', 'width']
+
+CUBE_FILE = "cube.npy"
+LABELS_FILE = "cube_labels.json"
+
+def save_cube(df, directory, region="BRASIL", metrics=None):
+    """
+    Write the cube of a processed table to directory. Tables without
+    'Ente Federativo' are stored under `region`. By default every numeric
+    column is stored, except the keys and the x_position/width columns.
+    """
+    if ENTE not in df.columns:
+        df = df.assign(**{ENTE: region})
+    if metrics is None:
+        metrics = [column for column in df.select_dtypes("number").columns if column not in KEYS + DERIVED]
+
+    years = sorted(int(year) for year in df[ANO].unique())
+    regions = sorted(df[ENTE].unique())
+    centils = sorted(int(centil) for centil in df[CENTIL].unique())
+
+    os.makedirs(directory, exist_ok=True)
+    shape = (len(years), len(regions), len(centils), len(metrics))
+    cube = np.lib.format.open_memmap(os.path.join(directory, CUBE_FILE), mode="w+", dtype=np.float64, shape=shape)
+    cube[:] = np.nan
+    cube[pd.Index(years).get_indexer(df[ANO]),
+         pd.Index(regions).get_indexer(df[ENTE]),
+         pd.Index(centils).get_indexer(df[CENTIL])] = df[metrics].to_numpy(dtype=float)
+    cube.flush()
+
+    labels = {"years": years, "regions": regions, "centils": centils, "metrics": metrics}
+    with open(os.path.join(directory, LABELS_FILE), "w", encoding="utf-8") as f:
+        json.dump(labels, f, ensure_ascii=False)
+    return MetricCube(cube, labels, region)
+
+class MetricCube:
+    def __init__(self, values, labels, region="BRASIL"):
+        self.values = values
+        self.labels = labels
+        self.region = region
+        self.centils = labels["centils"]
+        self.metrics = labels["metrics"]
+        self.x_positions = np.array([map_x_position(centil) for centil in self.centils], dtype=float)
+        self.widths = np.array([map_width(centil) for centil in self.centils], dtype=float)
+
+        self._positions = [{label: i for i, label in enumerate(labels[axis])}
+                           for axis in ["years", "regions", "centils", "metrics"]]
+
+    @classmethod
+    def open(cls, directory, region="BRASIL"):
+        """Memory-map a saved cube, read-only"""
+        with open(os.path.join(directory, LABELS_FILE), encoding="utf-8") as f:
+            labels = json.load(f)
+        return cls(np.load(os.path.join(directory, CUBE_FILE), mmap_mode="r"), labels, region)
+
+    def years(self):
+        return list(self.labels["years"])
+
+    def regions(self):
+        return list(self.labels["regions"])
+
+    def sel(self, year=None, region=None, centil=None, metric=None):
+        """
+        View of the cube; each axis is either selected by one label or kept
+        whole when left as None
+        """
+        index = tuple(slice(None) if label is None else positions[label]
+                      for label, positions in zip([year, region, centil, metric], self._positions))
+        return self.values[index]
+
+    def get(self, year, centil, column=None, region=None):
+        """Row (or single value, if column is given) of one centil"""
+        row = self.group(year, region).loc[centil]
+        return row if column is None else row[column]
+
+    def group(self, year, region=None):
+        """
+        Centils of a year/region as a DataFrame indexed by Centil, like
+        CentilIndex.group. Use sel for copy-free access.
+        """
+        df = pd.DataFrame(self.sel(year, region or self.region), index=pd.Index(self.centils, name=CENTIL),
+                          columns=self.metrics, copy=False)
+        df['x_position'] = self.x_positions
+        df['width'] = self.widths
+        return df.dropna(how="all", subset=self.metrics)
+
+    def range(self, year, start=None, stop=None, region=None):
+        """Centils from start to stop (codes, both inclusive) of a year/region"""
+        return self.group(year, region).loc[start:stop]
@@ -0,0 +1,94 @@
+"""
+Compact serialization of Plotly figures.
+
+Numeric trace data is written as plotly.js typed arrays
+({"dtype": "f8", "bdata": <base64 of the raw buffer>}) or as JSON number
+lists, whichever is shorter. Typed arrays use the smallest dtype that holds
+every value exactly, so integers and short decimals such as 2.5 take 1-4
+bytes; arbitrary floats need 8 bytes (~11 base64 characters), more than a
+short decimal like 0.12 as text. Both forms are lossless. plotly.py 6+
+writes every NumPy array as f8; on older versions the arrays are encoded
+here. Reading typed arrays requires plotly.js 2.28 or later.
+
+Passing decimals rounds the data to that many decimals and allows float32
+wherever it rounds to the same values. Only use it when every hover and axis
+label formats the data at that precision or coarser.
+"""
+import base64
+import json
+
+import numpy as np
+import plotly.io as pio
+
+# Integer dtypes understood by plotly.js, smallest first
+INTEGER_DTYPES = ["i1", "u1", "i2", "u2", "i4", "u4"]
+
+def _smallest_integer_dtype(values):
+    low, high = values.min(), values.max()
+    fitting = [c for c in INTEGER_DTYPES if np.iinfo(c).min <= low and high <= np.iinfo(c).max]
+    return fitting[0] if fitting else None
+
+def typed_array(values, decimals=None):
+    """
+    Encode a numeric NumPy array as a plotly.js typed array spec, using the
+    smallest dtype that holds every value exactly (or, if decimals is
+    given, that rounds to the same values at that many decimals)
+    """
+    values = np.asarray(values)
+
+    dtype = None
+    if values.size == 0:
+        dtype = "i1"
+    elif values.dtype.kind in "iu":
+        # plotly.js has no 64-bit integers
+        dtype = _smallest_integer_dtype(values)
+    elif values.dtype.kind == "f" and np.isfinite(values).all():
+        if (values == np.round(values)).all():
+            dtype = _smallest_integer_dtype(values)
+        if dtype is None and (values.astype("f4") == values).all():
+            dtype = "f4"
+    if dtype is None and decimals is not None and values.dtype.kind == "f":
+        rounded = np.round(values.astype("f4").astype("f8"), decimals)
+        if np.array_equal(rounded, np.round(values, decimals), equal_nan=True):
+            dtype = "f4"
+
+    buffer = np.ascontiguousarray(values, dtype=np.dtype(dtype or "f8").newbyteorder("<"))
+    return {"dtype": dtype or "f8", "bdata": base64.b64encode(buffer.tobytes()).decode("ascii")}
+
+def _compact_array(values, decimals):
+    # Typed array or number list, whichever serializes shorter
+    if decimals is not None and values.dtype.kind == "f":
+        values = np.round(values, decimals)
+    spec = typed_array(values, decimals)
+    numbers = values.tolist()
+    if len(json.dumps(numbers)) <= len(spec["bdata"]) + len('{"dtype":"f8","bdata":""}'):
+        return numbers
+    return spec
+
+def _encode(value, decimals):
+    if isinstance(value, np.ndarray) and value.dtype.kind in "iuf" and value.ndim == 1:
+        return _compact_array(value, decimals)
+    if isinstance(value, dict) and set(value) == {"dtype", "bdata"}:
+        # Already a typed array (plotly.py 6+)
+        return _compact_array(np.frombuffer(base64.b64decode(value["bdata"]), dtype=value["dtype"]), decimals)
+    if isinstance(value, dict):
+        return {key: _encode(item, decimals) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_encode(item, decimals) for item in value]
+    return value
+
+def compact_figure(fig, decimals=None):
+    """Figure dict with every numeric trace array in its shortest encoding"""
+    fig_dict = fig.to_plotly_json()
+    fig_dict["data"] = _encode(fig_dict["data"], decimals)
+    return fig_dict
+
+def figure_to_json(fig, decimals=None):
+    return pio.to_json(compact_figure(fig, decimals), validate=False)
+
+def write_figure_html(fig, path, include_plotlyjs="cdn", decimals=None):
+    pio.write_html(compact_figure(fig, decimals), path, validate=False, include_plotlyjs=include_plotlyjs)
+
+def show_figure(fig, decimals=None):
+    """Display a figure with its compact encoding, in place of fig.show()"""
+    pio.show(compact_figure(fig, decimals), validate=False)
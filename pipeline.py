@@ -0,0 +1,284 @@
+"""
+Load and preprocess the Receita centil table.
+
+Two interchangeable backends produce the same processed table and metrics:
+
+- "pandas": everything in memory, as in the original notebook
+- "duckdb": the embedded DuckDB engine runs the same steps as SQL over the
+  CSV or Parquet file, out-of-core and multithreaded. DuckDB is only needed
+  when this backend is selected.
+
+Razao_Rendimentos is computed within each (Ano-calendário, Ente Federativo)
+group, ordered by centil, so stacked years or regions never leak into each
+other. load_releases reads several releases concurrently and merges them.
+"""
+import glob
+import os
+import re
+import unicodedata
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+import pandas as pd
+
+from utils import (ANO, ENTE, CENTIL, QUANTIDADE, LIMITE_SUPERIOR, SOMA_RTB, IMPOSTO_DEVIDO,
+                   convert_brazilian_column, map_x_position, map_width)
+
+BACKENDS = ["pandas", "duckdb"]
+
+# Aggregated centils that duplicate other rows
+REDUNDANT_CENTILS = [100, 10010]
+
+def create_one_indexed_df(_df):
+    _df = _df.reset_index()
+    _df = _df.drop(["index"], axis=1)
+    _df.index = _df.index + 1
+    return _df
+
+def load_centil_table(path="data/distribuicao-renda.csv", region="BRASIL", backend="pandas"):
+    """
+    Load the processed centil table, sorted by (year, region, centil).
+    With region=None every Ente Federativo is kept, in the 'Ente Federativo'
+    column; otherwise that column is dropped, as in the notebook.
+    """
+    if backend == "pandas":
+        return _load_pandas(path, region)
+    elif backend == "duckdb":
+        return _load_duckdb(path, region)
+    raise ValueError(f"Unknown backend '{backend}', expected one of {BACKENDS}")
+
+def load_metrics(path="data/distribuicao-renda.csv", region="BRASIL", backend="pandas"):
+    """
+    Per (year, region) totals: contributors, RTB, tax due, effective tax rate
+    and the ratio between the upper limits of centils 100 and 99
+    """
+    if backend == "pandas":
+        return centil_metrics(_load_pandas(path, region))
+    elif backend == "duckdb":
+        return _metrics_duckdb(path, region)
+    raise ValueError(f"Unknown backend '{backend}', expected one of {BACKENDS}")
+
+#%%
+# pandas backend
+def _read_raw(path):
+    if str(path).endswith(".parquet"):
+        return pd.read_parquet(path)
+    return pd.read_csv(path, sep=";")
+
+def _load_pandas(path, region):
+    return process_centil_table(convert_numbers(_read_raw(path)), region)
+
+def convert_numbers(df):
+    """Convert every text column but 'Ente Federativo' from Brazilian number format to float"""
+    df = df.copy()
+    for column in df.columns:
+        if column != ENTE and df[column].dtype == "object":
+            try:
+                df[column] = convert_brazilian_column(df[column])
+            except Exception as e:
+                print(f"Error converting column {column}: {e}")
+    return df
+
+def process_centil_table(df, region):
+    """
+    Preprocess a raw table with numbers already converted: region filter,
+    redundant centils and the derived columns
+    """
+    df = df.copy()
+    df[QUANTIDADE] = df[QUANTIDADE]*1000
+    if region is not None:
+        df = df[df[ENTE] == region]
+        df = df.drop([ENTE], axis=1)
+
+    df = df[~df[CENTIL].isin(REDUNDANT_CENTILS)]
+    keys = [ANO, CENTIL] if region is not None else [ANO, ENTE, CENTIL]
+    df = create_one_indexed_df(df.sort_values(keys, kind="stable"))
+
+    limite = df[LIMITE_SUPERIOR]
+    previous = limite.groupby([df[k] for k in keys[:-1]]).shift(1)
+    df['Razao_Rendimentos'] = ((limite / previous) - 1)*100
+    df['Razao_Rendimentos'] = df['Razao_Rendimentos'].fillna(0)
+
+    df['Tax_Rate'] = (df[IMPOSTO_DEVIDO] / df[SOMA_RTB]) * 100
+    df['Tax_Rate'] = df['Tax_Rate'].fillna(0)
+
+    df['x_position'] = df[CENTIL].apply(map_x_position).astype(float)
+    df['width'] = df[CENTIL].apply(map_width)
+    return df
+
+def centil_metrics(df):
+    """Per (year, region) metrics of a processed centil table"""
+    keys = [ANO] if ENTE not in df.columns else [ANO, ENTE]
+    metrics = df.groupby(keys).agg(**{
+        QUANTIDADE: (QUANTIDADE, "sum"),
+        SOMA_RTB: (SOMA_RTB, "sum"),
+        IMPOSTO_DEVIDO: (IMPOSTO_DEVIDO, "sum"),
+    })
+    metrics['Tax_Rate'] = metrics[IMPOSTO_DEVIDO] / metrics[SOMA_RTB] * 100
+
+    limites = df.set_index(keys + [CENTIL])[LIMITE_SUPERIOR].unstack(CENTIL)
+    metrics['Razao_Centil_100'] = ((limites[1001010] / limites[99]) - 1)*100
+    return metrics.reset_index()
+
+#%%
+# Multiple releases
+# Column names used by other releases or extracts, by their current name
+COLUMN_ALIASES = {
+    ANO: ["Ano", "Ano Calendário", "Ano-Calendário", "Ano Calendario"],
+    ENTE: ["UF", "Estado", "Ente"],
+    QUANTIDADE: ["Qtde de Contribuintes", "Quantidade Contribuintes"],
+}
+
+def _canonical(column):
+    # Case, accents, spacing and punctuation do not distinguish columns
+    column = unicodedata.normalize("NFKD", str(column)).encode("ascii", "ignore").decode()
+    return re.sub(r"[^a-z0-9]", "", column.lower())
+
+def reconcile_columns(columns, renames=None):
+    """Mapping from the columns of a release to the current column names"""
+    known = [ANO, ENTE, CENTIL, QUANTIDADE, LIMITE_SUPERIOR, SOMA_RTB, IMPOSTO_DEVIDO]
+    lookup = {_canonical(name): name for name in known}
+    for name, aliases in COLUMN_ALIASES.items():
+        lookup.update({_canonical(alias): name for alias in aliases})
+    lookup.update({_canonical(alias): name for alias, name in (renames or {}).items()})
+    return {column: lookup.get(_canonical(column), column) for column in columns}
+
+def release_paths(source):
+    """Files of a directory (CSV and Parquet) or a glob pattern, sorted by path"""
+    if os.path.isdir(source):
+        patterns = [os.path.join(source, "*.csv"), os.path.join(source, "*.parquet")]
+    else:
+        patterns = [source]
+    return sorted(path for pattern in patterns for path in glob.glob(pattern))
+
+def _read_release(path, renames):
+    df = _read_raw(path)
+    return convert_numbers(df.rename(columns=reconcile_columns(df.columns, renames)))
+
+def load_releases(source, region="BRASIL", renames=None, executor="process", max_workers=None):
+    """
+    Load every release in a directory or glob concurrently and merge them
+    into one processed table. Rows repeated across files are kept once, from
+    the last file by path, so newer releases should sort last.
+    renames maps extra column names to the current ones.
+    """
+    paths = release_paths(source)
+    if not paths:
+        raise FileNotFoundError(f"No CSV or Parquet files found for '{source}'")
+
+    pool = ProcessPoolExecutor if executor == "process" else ThreadPoolExecutor
+    with pool(max_workers) as workers:
+        tables = list(workers.map(_read_release, paths, [renames] * len(paths)))
+
+    df = pd.concat(tables, ignore_index=True)
+    df = df.drop_duplicates(subset=[ANO, ENTE, CENTIL], keep="last")
+    return process_centil_table(df, region)
+
+#%%
+# DuckDB backend
+def _quote(column):
+    return f'"{column}"'
+
+def _numeric_sql(column, sql_type):
+    # Same conversion as convert_brazilian_number for VARCHAR columns
+    if sql_type == "VARCHAR":
+        return f"CAST(REPLACE(REPLACE({_quote(column)}, '.', ''), ',', '.') AS DOUBLE)"
+    return _quote(column)
+
+def _ratio_sql(numerator, denominator):
+    # pandas division semantics: x/0 is ±inf, 0/0 is NaN (filled with 0 later)
+    return f"""CASE WHEN {denominator} = 0 THEN
+            CASE WHEN {numerator} > 0 THEN 'inf'::DOUBLE WHEN {numerator} < 0 THEN '-inf'::DOUBLE END
+        ELSE {numerator} / {denominator} END"""
+
+def _group_keys_sql(region):
+    return _quote(ANO) if region is not None else f"{_quote(ANO)}, {_quote(ENTE)}"
+
+def _source_sql(path):
+    path = str(path).replace("'", "''")
+    if path.endswith(".parquet"):
+        return f"read_parquet('{path}')"
+    return f"read_csv('{path}', delim=';', header=true)"
+
+def _processed_sql(con, path, region):
+    source = _source_sql(path)
+    columns = con.execute(f"DESCRIBE SELECT * FROM {source}").fetchall()
+
+    # Convert every column first: Centil itself may be text ("1.001.010")
+    select = []
+    for name, sql_type, *_ in columns:
+        if name == ENTE:
+            select.append(_quote(name))
+        elif name == QUANTIDADE:
+            select.append(f"{_numeric_sql(name, sql_type)} * 1000 AS {_quote(name)}")
+        else:
+            select.append(f"{_numeric_sql(name, sql_type)} AS {_quote(name)}")
+
+    # Filters run on the converted columns
+    where = [f"{_quote(CENTIL)} NOT IN ({', '.join(map(str, REDUNDANT_CENTILS))})"]
+    exclude = ""
+    if region is not None:
+        region = region.replace("'", "''")
+        where.append(f"{_quote(ENTE)} = '{region}'")
+        exclude = f" EXCLUDE ({_quote(ENTE)})"
+    keys = _group_keys_sql(region)
+
+    centil = _quote(CENTIL)
+    previous = f"LAG({_quote(LIMITE_SUPERIOR)}) OVER (PARTITION BY {keys} ORDER BY {centil})"
+    razao = f"({_ratio_sql(_quote(LIMITE_SUPERIOR), previous)} - 1) * 100"
+    tax_rate = f"{_ratio_sql(_quote(IMPOSTO_DEVIDO), _quote(SOMA_RTB))} * 100"
+
+    return f"""
+        WITH converted AS (
+            SELECT {", ".join(select)} FROM {source}
+        ),
+        raw AS (
+            SELECT *{exclude} FROM converted WHERE {" AND ".join(where)}
+        )
+        SELECT *,
+            COALESCE(NULLIF({razao}, 'nan'::DOUBLE), 0) AS Razao_Rendimentos,
+            COALESCE(NULLIF({tax_rate}, 'nan'::DOUBLE), 0) AS Tax_Rate,
+            CASE
+                WHEN {centil} <= 99 THEN {centil}::DOUBLE
+                WHEN {centil} BETWEEN 1001 AND 1009 THEN 99 + ({centil} - 1000) * 0.1::DOUBLE
+                WHEN {centil} BETWEEN 100101 AND 100110 THEN 99.9::DOUBLE + ({centil} - 100100) * 0.01::DOUBLE
+                WHEN {centil} = 1001010 THEN 100.0
+                ELSE {centil}::DOUBLE
+            END AS x_position,
+            CASE
+                WHEN {centil} <= 99 THEN 2.0
+                WHEN {centil} BETWEEN 1001 AND 1009 THEN 1.0
+                WHEN {centil} >= 100101 THEN 1.0
+                ELSE 2.0
+            END AS width
+        FROM raw
+        ORDER BY {keys}, {centil}
+    """
+
+def _load_duckdb(path, region):
+    import duckdb
+
+    with duckdb.connect() as con:
+        df = con.execute(_processed_sql(con, path, region)).df()
+    return create_one_indexed_df(df)
+
+def _metrics_duckdb(path, region):
+    import duckdb
+
+    keys = _group_keys_sql(region)
+    limite = _quote(LIMITE_SUPERIOR)
+    centil = _quote(CENTIL)
+    with duckdb.connect() as con:
+        query = f"""
+            WITH processed AS ({_processed_sql(con, path, region)})
+            SELECT {keys},
+                SUM({_quote(QUANTIDADE)}) AS {_quote(QUANTIDADE)},
+                SUM({_quote(SOMA_RTB)}) AS {_quote(SOMA_RTB)},
+                SUM({_quote(IMPOSTO_DEVIDO)}) AS {_quote(IMPOSTO_DEVIDO)},
+                SUM({_quote(IMPOSTO_DEVIDO)}) / SUM({_quote(SOMA_RTB)}) * 100 AS Tax_Rate,
+                (MAX({limite}) FILTER (WHERE {centil} = 1001010)
+                    / MAX({limite}) FILTER (WHERE {centil} = 99) - 1) * 100 AS Razao_Centil_100
+            FROM processed
+            GROUP BY {keys}
+            ORDER BY {keys}
+        """
+        return con.execute(query).df()
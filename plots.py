@@ -0,0 +1,714 @@
+"""
+Plotly figures of the centil table.
+
+Every function builds and returns the figure; display it in the notebook
+with figures.show_figure, or serialize it compactly with
+figures.figure_to_json.
+"""
+import numpy as np
+import pandas as pd
+import plotly.graph_objects as go
+
+# Above these sizes, overlays are drawn with WebGL instead of SVG
+WEBGL_MAX_TRACES = 50
+WEBGL_MAX_POINTS = 20_000
+
+def prepare_data_for_plotting(centis, limit):
+    # Already sorted by x position, with x_position and width columns
+    return centis.range(2020, stop=limit).copy()
+
+def plot_razao_rendimentos(df):
+    # Prepare data for plotting (one year, indexed by Centil)
+    df_graphed = df.copy()
+    
+    # Create filtered version without centil 7 and 99.99
+    df_filtered = df_graphed.drop([1, 2, 3, 4, 5, 6, 7, 8, 1001010], errors='ignore')
+    
+    # Create scaled version for high centils (excluding centil 100)
+    df_scaled = df_graphed.loc[95:].drop(1001010, errors='ignore')
+    df_scaled['Razao_Rendimentos_Scaled'] = df_scaled['Razao_Rendimentos'].copy()
+    
+    # Create scaled version including centil 100
+    df_scaled_with_100 = df_graphed.loc[95:].copy()
+    df_scaled_with_100['Razao_Rendimentos_Scaled'] = df_scaled_with_100['Razao_Rendimentos'].copy()
+    
+    # Apply scaling based on centil ranges (99.1-99.9 and 99.91-99.99)
+    df_scaled.loc[1001:1009, 'Razao_Rendimentos_Scaled'] *= 10
+    df_scaled.loc[100101:100109, 'Razao_Rendimentos_Scaled'] *= 100
+    
+    # Create the plot
+    fig = go.Figure()
+    
+    # Add line trace for full data
+    fig.add_trace(go.Scatter(
+        x=df_graphed['x_position'],
+        y=df_graphed['Razao_Rendimentos'],
+        mode='lines+markers',
+        line=dict(color='rgb(33, 102, 172)', width=2),
+        marker=dict(size=6),
+        hovertemplate='Centil: %{x}<br>Razão: %{y:.2f}<extra></extra>',
+        name='Todos os Centis',
+        visible=True
+    ))
+    
+    # Add line trace for filtered data
+    fig.add_trace(go.Scatter(
+        x=df_filtered['x_position'],
+        y=df_filtered['Razao_Rendimentos'],
+        mode='lines+markers',
+        line=dict(color='rgb(33, 102, 172)', width=2),
+        marker=dict(size=6),
+        hovertemplate='Centil: %{x}<br>Razão: %{y:.2f}<extra></extra>',
+        name='Excluindo Centil 7 e 99.99',
+        visible=False
+    ))
+    
+    # Add line trace for scaled high centils
+    fig.add_trace(go.Scatter(
+        x=df_scaled['x_position'],
+        y=df_scaled['Razao_Rendimentos_Scaled'],
+        mode='lines+markers',
+        line=dict(color='rgb(33, 102, 172)', width=2),
+        marker=dict(size=6),
+        hovertemplate='Centil: %{x}<br>Razão (Escalada): %{y:.2f}<extra></extra>',
+        name='Centis 95+ (Escalado)',
+        visible=False
+    ))
+    
+    # Create annotations for each view
+    # Annotation for last value in "Todos os Centis" view
+    last_value = df_graphed.loc[1001010, 'Razao_Rendimentos']
+    last_x = df_graphed.loc[1001010, 'x_position']
+    annotation_all = [dict(
+        x=last_x,
+        y=last_value,
+        text=f"Centil 100:<br>{last_value:.2f}%",
+        showarrow=True,
+        arrowhead=2,
+        arrowsize=1.5,
+        arrowwidth=2,
+        arrowcolor="red",
+        ax=-60,
+        ay=-60,
+        standoff=10
+    )]
+    
+    # Create annotations for specific points in "Últimos Centis" view
+    annotation_scaled = []
+    
+    # Get points by centil code (99.7 -> 1007, 99.9 -> 1009, 99.99 -> 100109)
+    
+    # Add annotations only for points that exist
+    if 1007 in df_scaled.index:
+        point_99_7 = df_scaled.loc[1007]
+        annotation_scaled.append(dict(
+            x=point_99_7['x_position'],
+            y=point_99_7['Razao_Rendimentos_Scaled'],
+            text=f"Centil 99.7:<br>{point_99_7['Razao_Rendimentos_Scaled']:.2f}%",
+            showarrow=True,
+            arrowhead=2,
+            arrowsize=1.5,
+            arrowwidth=2,
+            arrowcolor="red",
+            ax=-120,
+            ay=-60,
+            standoff=10
+        ))
+    
+    if 1009 in df_scaled.index:
+        point_99_9 = df_scaled.loc[1009]
+        annotation_scaled.append(dict(
+            x=point_99_9['x_position'],
+            y=point_99_9['Razao_Rendimentos_Scaled'],
+            text=f"Centil 99.9:<br>{point_99_9['Razao_Rendimentos_Scaled']:.2f}%",
+            showarrow=True,
+            arrowhead=2,
+            arrowsize=1.5,
+            arrowwidth=2,
+            arrowcolor="red",
+            ax=-60,
+            ay=-60,
+            standoff=10
+        ))
+    
+    if 100109 in df_scaled.index:
+        point_99_99 = df_scaled.loc[100109]
+        annotation_scaled.append(dict(
+            x=point_99_99['x_position'],
+            y=point_99_99['Razao_Rendimentos_Scaled'],
+            text=f"Centil 99.99:<br>{point_99_99['Razao_Rendimentos_Scaled']:.2f}%",
+            showarrow=True,
+            arrowhead=2,
+            arrowsize=1.5,
+            arrowwidth=2,
+            arrowcolor="red",
+            ax=-60,
+            ay=-60,
+            standoff=10
+        ))
+    
+    # Update layout
+    fig.update_layout(
+        title={
+            'text': f'Porcentagem entre Consecutivos Rendimentos Tributáveis por Centil 2020',
+            'y': 0.95,
+            'x': 0.5,
+            'xanchor': 'center',
+            'yanchor': 'top',
+            'font': {'size': 14}
+        },
+        xaxis_title='Centil',
+        yaxis_title='Porcentagem entre Consecutivos Rendimentos',
+        template='plotly_white',
+        width=1200,
+        height=600,
+        showlegend=True,
+        annotations=annotation_all  # Start with "Todos os Centis" annotations
+    )
+    
+    # Add buttons for switching between views
+    fig.update_layout(
+        updatemenus=[
+            dict(
+                type="buttons",
+                direction="right",
+                buttons=list([
+                    dict(
+                        args=[{"visible": [True, False, False]},
+                              {"title": f"Porcentagem entre Consecutivos Rendimentos Tributáveis por Centil 2020",
+                               "annotations": annotation_all}],
+                        label="Todos os Centis",
+                        method="update"
+                    ),
+                    dict(
+                        args=[{"visible": [False, True, False]},
+                              {"title": f"Porcentagem entre Consecutivos Rendimentos Tributáveis por Centil 2020 (Excluindo Centil 7 e 99.99)",
+                               "annotations": []}],
+                        label="Excluindo Centil 7 e 99.99",
+                        method="update"
+                    ),
+                    dict(
+                        args=[{"visible": [False, False, True]},
+                              {"title": f"Porcentagem entre Consecutivos Rendimentos Tributáveis por Centil 2020 (Últimos Centis)",
+                               "annotations": annotation_scaled}],
+                        label="Últimos Centis",
+                        method="update"
+                    )
+                ]),
+                pad={"r": 10, "t": 10},
+                showactive=True,
+                x=0.1,
+                xanchor="left",
+                y=1.1,
+                yanchor="top"
+            )
+        ]
+    )
+    
+    return fig
+
+def choose_scatter(n_traces, n_points, render_mode="auto"):
+    """
+    Trace type for an overlay: go.Scatter (SVG) or go.Scattergl (WebGL).
+    In "auto" mode, WebGL is used above WEBGL_MAX_TRACES or WEBGL_MAX_POINTS.
+    """
+    if render_mode == "auto":
+        render_mode = "webgl" if n_traces > WEBGL_MAX_TRACES or n_points > WEBGL_MAX_POINTS else "svg"
+    return go.Scattergl if render_mode == "webgl" else go.Scatter
+
+def _downsample_indices(lines, n_buckets):
+    # Positions of the minimum and maximum of every line in each bucket
+    edges = np.linspace(0, lines.shape[1], n_buckets + 1).astype(int)
+    bucket = np.repeat(np.arange(n_buckets), np.diff(edges))
+
+    keep = []
+    for y in lines:
+        # Sorting by (bucket, y) puts each bucket's minimum first and maximum last
+        order = np.lexsort((y, bucket))
+        keep.extend([order[edges[:-1]], order[edges[1:] - 1]])
+    return np.unique(np.concatenate(keep))
+
+def downsample_series(x, *ys, max_points=None):
+    """
+    Keep at most max_points points of one or more series sharing x,
+    preserving the minimum and maximum of every series in each bucket so
+    peaks survive (with one bucket, at least two points per series)
+    """
+    x = np.asarray(x)
+    ys = [np.asarray(y) for y in ys]
+    if max_points is None or len(x) <= max_points:
+        return (x, *ys)
+
+    # Each bucket keeps at most a minimum and a maximum per series
+    n_buckets = max(max_points // (2 * len(ys)), 1)
+    keep = _downsample_indices(np.vstack(ys), n_buckets)
+    return (x[keep], *(y[keep] for y in ys))
+
+def _aggregate_regions(series):
+    # Median and min-max band across regions of the same year
+    by_region = pd.DataFrame({region: pd.Series(y, index=x) for _, region, x, y in series}).sort_index()
+    x = by_region.index.to_numpy()
+    return x, by_region.median(axis=1).to_numpy(), by_region.min(axis=1).to_numpy(), by_region.max(axis=1).to_numpy()
+
+def plot_razao_rendimentos_multiple_years(centis, regions=None, render_mode="auto", overview=False, max_points=None):
+    """
+    One trace per year (and per Ente Federativo, if several regions are given).
+    Large overlays switch to WebGL (see choose_scatter); overview=True
+    collapses the regions of each year into a median line with a min-max
+    band, and max_points downsamples every trace (after aggregation).
+    """
+    # Get unique years
+    years = centis.years()
+    regions = regions or [centis.region]
+    
+    # Create the plot
+    fig = go.Figure()
+    
+    def get_color_for_year(year):
+        # Define start and end colors (RGB)
+        start_color = (33, 102, 172)  # Blue
+        end_color = (127, 188, 65)    # Green
+        
+        # Calculate interpolation factor (0 to 1)
+        min_year = min(years)
+        max_year = max(years)
+        factor = (year - min_year) / (max_year - min_year)
+        
+        # Interpolate each RGB component
+        r = int(start_color[0] + (end_color[0] - start_color[0]) * factor)
+        g = int(start_color[1] + (end_color[1] - start_color[1]) * factor)
+        b = int(start_color[2] + (end_color[2] - start_color[2]) * factor)
+        
+        return f'rgb({r}, {g}, {b})'
+    
+    # Compute the series for each year and region
+    series = []
+    for year in years:
+        for region in regions:
+            # Get data for this year, skipping the first 14 centils
+            df_year = centis.range(year, start=15, region=region).drop([100, 10010, 1001010], errors='ignore')
+            
+            # Calculate ratio
+            razao = ((df_year['Rendimentos Tributaveis - Limite Superior da RTB do Centil [R$ milhões]'] / df_year['Rendimentos Tributaveis - Limite Superior da RTB do Centil [R$ milhões]'].shift(1)) - 1) * 100
+            series.append((year, region, df_year['x_position'].to_numpy(), razao.fillna(0).to_numpy()))
+    
+    # Trace specs (year, kwargs), built before choosing the trace type
+    traces = []
+    if overview and len(regions) > 1:
+        for year in years:
+            x, median, low, high = downsample_series(*_aggregate_regions([s for s in series if s[0] == year]),
+                                                     max_points=max_points)
+            year_color = get_color_for_year(year)
+            band_color = year_color.replace('rgb', 'rgba').replace(')', ', 0.2)')
+            traces.append((year, dict(x=x, y=low, mode='lines', line=dict(width=0), hoverinfo='skip',
+                                      showlegend=False, name=f'{year} (mín.)')))
+            traces.append((year, dict(x=x, y=high, mode='lines', line=dict(width=0), fill='tonexty',
+                                      fillcolor=band_color, hoverinfo='skip', name=f'{year} (mín.-máx.)')))
+            traces.append((year, dict(x=x, y=median, mode='lines+markers', line=dict(color=year_color, width=2),
+                                      marker=dict(size=6), name=f'{year} (mediana)',
+                                      hovertemplate='Ano: ' + str(year) + '<br>Centil: %{x}<br>Razão (mediana): %{y:.2f}<extra></extra>')))
+    else:
+        for year, region, x, y in series:
+            x, y = downsample_series(x, y, max_points=max_points)
+            label = str(year) if len(regions) == 1 else f'{year} - {region}'
+            hover_region = '' if len(regions) == 1 else '<br>Ente: ' + region
+            traces.append((year, dict(
+                x=x,
+                y=y,
+                mode='lines+markers',
+                line=dict(color=get_color_for_year(year), width=2),
+                marker=dict(size=6),
+                hovertemplate='Ano: ' + str(year) + hover_region + '<br>Centil: %{x}<br>Razão: %{y:.2f}<extra></extra>',
+                name=label
+            )))
+    
+    # Add traces, as WebGL when the overlay is large
+    scatter = choose_scatter(len(traces), sum(len(spec['x']) for _, spec in traces), render_mode)
+    for year, spec in traces:
+        fig.add_trace(scatter(**spec, visible=True if year == 2020 else False))
+    trace_years = [year for year, _ in traces]
+    
+    # Update layout
+    fig.update_layout(
+        title={
+            'text': 'Razão entre Consecutivos Rendimentos Tributáveis por Centil (2006-2020)',
+            'y': 0.95,
+            'x': 0.5,
+            'xanchor': 'center',
+            'yanchor': 'top',
+            'font': {'size': 14}
+        },
+        xaxis_title='Centil',
+        yaxis_title='Razão entre Consecutivos Rendimentos',
+        template='plotly_white',
+        width=1200,
+        height=600,
+        showlegend=True
+    )
+    
+    # Create buttons for each year
+    buttons = []
+    for year in years:
+        # Create visibility list for this button
+        visibility = [True if y == year else False for y in trace_years]
+        
+        # Create color list for this button
+        colors = [get_color_for_year(y) if y == year else 'rgb(200, 200, 200)' for y in years]
+        
+        # Create button
+        buttons.append(
+            dict(
+                args=[{"visible": visibility},
+                      {"title": f'Razão entre Consecutivos Rendimentos Tributáveis por Centil ({year})'}],
+                label=str(year),
+                method="update"
+            )
+        )
+    
+    # Add buttons to layout
+    fig.update_layout(
+        updatemenus=[
+            dict(
+                type="buttons",
+                direction="right",
+                buttons=buttons,
+                pad={"r": 10, "t": 10},
+                showactive=True,
+                x=0.1,
+                xanchor="left",
+                y=1.1,
+                yanchor="top"
+            )
+        ]
+    )
+    
+    return fig
+
+def plot_renda_custom_plotly(centis):
+    # Prepare data for each range
+    df_graphed_99 = prepare_data_for_plotting(centis, 99)
+    df_graphed_100101 = prepare_data_for_plotting(centis, 100101)
+    df_graphed_100107 = prepare_data_for_plotting(centis, 100107)
+    df_graphed_100109 = prepare_data_for_plotting(centis, 100109)
+    df_graphed_all = prepare_data_for_plotting(centis, 1001111)
+
+    # Limite Superior grows with the centil, so each range peaks at its last row
+    max_99 = df_graphed_99['Rendimentos Tributaveis - Limite Superior da RTB do Centil [R$ milhões]'].iloc[-1]
+    max_100101 = df_graphed_100101['Rendimentos Tributaveis - Limite Superior da RTB do Centil [R$ milhões]'].iloc[-1]
+    max_100107 = df_graphed_100107['Rendimentos Tributaveis - Limite Superior da RTB do Centil [R$ milhões]'].iloc[-1]
+    max_100109 = df_graphed_100109['Rendimentos Tributaveis - Limite Superior da RTB do Centil [R$ milhões]'].iloc[-1]
+
+    # Get x positions where the maximum values are first reached
+    x_99 = df_graphed_99['x_position'].iloc[df_graphed_99['Rendimentos Tributaveis - Limite Superior da RTB do Centil [R$ milhões]'].searchsorted(max_99)]
+    x_100101 = df_graphed_100101['x_position'].iloc[df_graphed_100101['Rendimentos Tributaveis - Limite Superior da RTB do Centil [R$ milhões]'].searchsorted(max_100101)]
+    x_100107 = df_graphed_100107['x_position'].iloc[df_graphed_100107['Rendimentos Tributaveis - Limite Superior da RTB do Centil [R$ milhões]'].searchsorted(max_100107)]
+    x_100109 = df_graphed_100109['x_position'].iloc[df_graphed_100109['Rendimentos Tributaveis - Limite Superior da RTB do Centil [R$ milhões]'].searchsorted(max_100109)]
+
+    # Create the plot
+    fig = go.Figure()
+
+    # Add line traces
+    fig.add_trace(go.Scatter(
+        x=df_graphed_99['x_position'],
+        y=df_graphed_99['Rendimentos Tributaveis - Limite Superior da RTB do Centil [R$ milhões]'],
+        name='Até Centil 99',
+        visible=True,
+        mode='lines+markers',
+        line=dict(color='rgb(33, 102, 172)', width=2),
+        marker=dict(size=6),
+        hovertemplate='Centil: %{x}<br>Rendimentos: %{y:.2f} R$ milhões<extra></extra>'
+    ))
+
+    fig.add_trace(go.Scatter(
+        x=df_graphed_100101['x_position'],
+        y=df_graphed_100101['Rendimentos Tributaveis - Limite Superior da RTB do Centil [R$ milhões]'],
+        name='Até 99.90% (Linha)',
+        visible=False,
+        mode='lines+markers',
+        line=dict(color='rgb(33, 102, 172)', width=2),
+        marker=dict(size=6),
+        hovertemplate='Centil: %{x}<br>Rendimentos: %{y:.2f} R$ milhões<extra></extra>'
+    ))
+
+    fig.add_trace(go.Scatter(
+        x=df_graphed_100107['x_position'],
+        y=df_graphed_100107['Rendimentos Tributaveis - Limite Superior da RTB do Centil [R$ milhões]'],
+        name='Até 99.97% (Linha)',
+        visible=False,
+        mode='lines+markers',
+        line=dict(color='rgb(33, 102, 172)', width=2),
+        marker=dict(size=6),
+        hovertemplate='Centil: %{x}<br>Rendimentos: %{y:.2f} R$ milhões<extra></extra>'
+    ))
+
+    fig.add_trace(go.Scatter(
+        x=df_graphed_100109['x_position'],
+        y=df_graphed_100109['Rendimentos Tributaveis - Limite Superior da RTB do Centil [R$ milhões]'],
+        name='Até 99.99% (Linha)',
+        visible=False,
+        mode='lines+markers',
+        line=dict(color='rgb(33, 102, 172)', width=2),
+        marker=dict(size=6),
+        hovertemplate='Centil: %{x}<br>Rendimentos: %{y:.2f} R$ milhões<extra></extra>'
+    ))
+
+    fig.add_trace(go.Scatter(
+        x=df_graphed_all['x_position'],
+        y=df_graphed_all['Rendimentos Tributaveis - Limite Superior da RTB do Centil [R$ milhões]'],
+        name='Todos os Centis (Linha)',
+        visible=False,
+        mode='lines+markers',
+        line=dict(color='rgb(33, 102, 172)', width=2),
+        marker=dict(
+            size=6
+        ),
+        hovertemplate='Centil: %{x}<br>Rendimentos: %{y:.2f} R$ milhões<extra></extra>'
+    ))
+
+    # Update layout
+    fig.update_layout(
+        title={
+            'text': 'Rendimentos Tributáveis por Centil 2020',
+            'y': 0.95,
+            'x': 0.5,
+            'xanchor': 'center',
+            'yanchor': 'top',
+            'font': {'size': 14}
+        },
+        xaxis_title='Centil',
+        yaxis_title='Rendimentos Tributáveis - Limite Superior',
+        template='plotly_white',
+        width=1200,
+        height=600,
+        showlegend=False,
+        barmode='overlay'
+    )
+
+    # Create annotations for each range
+    annotations_100101 = [
+        dict(
+            x=x_99,
+            y=max_99,
+            text=f"Centil 99:<br>{max_99:.2f}",
+            showarrow=True,
+            arrowhead=2,
+            arrowsize=1.5,
+            arrowwidth=2,
+            arrowcolor="red",
+            ax=-60,
+            ay=-60,
+            standoff=10  # Add some spacing between arrow and point
+        )
+    ]
+
+    annotations_100107 = annotations_100101 + [
+        dict(
+            x=x_100101,
+            y=max_100101,
+            text=f"Centil 99.90:<br>{max_100101:.2f}",
+            showarrow=True,
+            arrowhead=2,
+            arrowsize=1.5,
+            arrowwidth=2,
+            arrowcolor="red",
+            ax=-60,
+            ay=-60,
+            standoff=10
+        )
+    ]
+
+    annotations_100109 = annotations_100107 + [
+        dict(
+            x=x_100107,
+            y=max_100107,
+            text=f"Centil 99.97:<br>{max_100107:.2f}",
+            showarrow=True,
+            arrowhead=2,
+            arrowsize=1.5,
+            arrowwidth=2,
+            arrowcolor="red",
+            ax=-60,
+            ay=-60,
+            standoff=10
+        )
+    ]
+
+    annotations_all = [
+        dict(
+            x=x_100109,
+            y=max_100109,
+            text=f"Centil 99.99:<br>{max_100109:.2f}",
+            showarrow=True,
+            arrowhead=2,
+            arrowsize=1.5,
+            arrowwidth=2,
+            arrowcolor="red",
+            ax=-60,
+            ay=-60,
+            standoff=10
+        )
+    ]
+
+    # Add buttons for different centil ranges with annotations
+    fig.update_layout(
+        updatemenus=[
+            dict(
+                type="buttons",
+                direction="right",
+                buttons=list([
+                    dict(
+                        args=[{"visible": [True, False, False, False, False]},
+                              {"annotations": []}],
+                        label="Até Centil 99",
+                        method="update"
+                    ),
+                    dict(
+                        args=[{"visible": [False, True, False, False, False]},
+                              {"annotations": annotations_100101}],
+                        label="Até 99.90%",
+                        method="update"
+                    ),
+                    dict(
+                        args=[{"visible": [False, False, True, False, False]},
+                              {"annotations": annotations_100107}],
+                        label="Até 99.97%",
+                        method="update"
+                    ),
+                    dict(
+                        args=[{"visible": [False, False, False, True, False]},
+                              {"annotations": annotations_100109}],
+                        label="Até 99.99%",
+                        method="update"
+                    ),
+                    dict(
+                        args=[{"visible": [False, False, False, False, True]},
+                              {"annotations": annotations_all}],
+                        label="Todos os Centis",
+                        method="update"
+                    )
+                ]),
+                pad={"r": 10, "t": 10},
+                showactive=True,
+                x=0.1,
+                xanchor="left",
+                y=1.1,
+                yanchor="top"
+            )
+        ]
+    )
+
+    return fig
+
+def plot_imposto_devido_2020(centis):
+    # Prepare data for plotting
+    df_graphed = centis.group(2020)
+    
+    # Create the plot
+    fig = go.Figure()
+    
+    # Add line trace
+    fig.add_trace(go.Scatter(
+        x=df_graphed['x_position'],
+        y=df_graphed['Imposto Devido [R$ milhões]'],
+        mode='lines+markers',
+        line=dict(color='rgb(33, 102, 172)', width=2),
+        marker=dict(size=6),
+        hovertemplate='Centil: %{x}<br>Imposto Devido: %{y:.2f} R$ milhões<extra></extra>',
+        name='Imposto Devido'
+    ))
+    
+    # Update layout
+    fig.update_layout(
+        title={
+            'text': 'Imposto Devido por Centil 2020',
+            'y': 0.95,
+            'x': 0.5,
+            'xanchor': 'center',
+            'yanchor': 'top',
+            'font': {'size': 14}
+        },
+        xaxis_title='Centil',
+        yaxis_title='Imposto Devido (R$ milhões)',
+        template='plotly_white',
+        width=1200,
+        height=600,
+        showlegend=False
+    )
+    
+    return fig
+
+def plot_rendimentos_tributaveis_soma_2020(centis):
+    # Prepare data for plotting
+    df_graphed = centis.group(2020)
+    
+    # Create the plot
+    fig = go.Figure()
+    
+    # Add line trace
+    fig.add_trace(go.Scatter(
+        x=df_graphed['x_position'],
+        y=df_graphed['Rendimentos Tributaveis - Soma da RTB do Centil [R$ milhões]'],
+        mode='lines+markers',
+        line=dict(color='rgb(33, 102, 172)', width=2),
+        marker=dict(size=6),
+        hovertemplate='Centil: %{x}<br>Soma RTB: %{y:.2f} R$ milhões<extra></extra>',
+        name='Soma RTB'
+    ))
+    
+    # Update layout
+    fig.update_layout(
+        title={
+            'text': 'Soma dos Rendimentos Tributáveis por Centil 2020',
+            'y': 0.95,
+            'x': 0.5,
+            'xanchor': 'center',
+            'yanchor': 'top',
+            'font': {'size': 14}
+        },
+        xaxis_title='Centil',
+        yaxis_title='Soma dos Rendimentos Tributáveis (R$ milhões)',
+        template='plotly_white',
+        width=1200,
+        height=600,
+        showlegend=False
+    )
+    
+    return fig
+
+def plot_tax_rate_2020(centis):
+    # Prepare data for plotting
+    df_graphed = centis.group(2020)
+    
+    # Create the plot
+    fig = go.Figure()
+    
+    # Add line trace
+    fig.add_trace(go.Scatter(
+        x=df_graphed['x_position'],
+        y=df_graphed['Tax_Rate'],
+        mode='lines+markers',
+        line=dict(color='rgb(33, 102, 172)', width=2),
+        marker=dict(size=6),
+        hovertemplate='Centil: %{x}<br>Taxa de Tributação: %{y:.2f}%<extra></extra>',
+        name='Taxa de Tributação'
+    ))
+    
+    # Update layout
+    fig.update_layout(
+        title={
+            'text': 'Taxa de Tributação por Centil 2020',
+            'y': 0.95,
+            'x': 0.5,
+            'xanchor': 'center',
+            'yanchor': 'top',
+            'font': {'size': 14}
+        },
+        xaxis_title='Centil',
+        yaxis_title='Taxa de Tributação (%)',
+        template='plotly_white',
+        width=1200,
+        height=600,
+        showlegend=False
+    )
+    
+    return fig
@@ -0,0 +1,121 @@
+"""
+Share the processed centil table between worker processes.
+
+The table is published once into a single multiprocessing.shared_memory
+block; workers attach to it and get read-only, zero-copy NumPy views wrapped
+in a DataFrame. Only the small SharedTableSpec is pickled to the workers,
+so per-region jobs start without copying the table.
+
+Text columns (e.g. 'Ente Federativo') are stored as categorical codes.
+"""
+import sys
+from dataclasses import dataclass
+from multiprocessing import Pool, shared_memory
+
+import numpy as np
+import pandas as pd
+
+from utils import ANO, ENTE, QUANTIDADE, SOMA_RTB, IMPOSTO_DEVIDO
+
+# Column offsets are aligned to this many bytes
+ALIGNMENT = 8
+
+@dataclass(frozen=True)
+class SharedTableSpec:
+    name: str
+    nrows: int
+    index_start: int
+    # (column, dtype, byte offset) of every column in the block
+    columns: tuple
+    # Categories of the text columns, stored as codes
+    categories: dict
+
+def _aligned(offset):
+    return (offset + ALIGNMENT - 1) // ALIGNMENT * ALIGNMENT
+
+class SharedCentilTable:
+    """
+    Owner of the shared block. Use as a context manager, or call close() to
+    release it; workers must be done with it by then.
+    """
+    def __init__(self, df):
+        arrays = {}
+        categories = {}
+        for column in df.columns:
+            values = df[column]
+            if values.dtype.kind not in "biuf":
+                values = values.astype("category")
+                categories[column] = list(values.cat.categories)
+                values = values.cat.codes
+            arrays[column] = np.ascontiguousarray(values.to_numpy())
+
+        layout = []
+        offset = 0
+        for column, array in arrays.items():
+            offset = _aligned(offset)
+            layout.append((column, array.dtype.str, offset))
+            offset += array.nbytes
+
+        self.shm = shared_memory.SharedMemory(create=True, size=max(offset, 1))
+        for (column, dtype, offset), array in zip(layout, arrays.values()):
+            view = np.ndarray(array.shape, dtype=dtype, buffer=self.shm.buf, offset=offset)
+            view[:] = array
+
+        index_start = df.index[0] if isinstance(df.index, pd.RangeIndex) and len(df) else 0
+        self.spec = SharedTableSpec(self.shm.name, len(df), int(index_start), tuple(layout), categories)
+
+    def close(self):
+        self.shm.close()
+        self.shm.unlink()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+def attach_centil_table(spec):
+    """
+    Read-only DataFrame over a published table. Returns (df, shm); keep shm
+    referenced for as long as df is used.
+    """
+    if sys.version_info >= (3, 13):
+        shm = shared_memory.SharedMemory(name=spec.name, track=False)
+    else:
+        shm = shared_memory.SharedMemory(name=spec.name)
+
+    columns = {}
+    for column, dtype, offset in spec.columns:
+        values = np.ndarray((spec.nrows,), dtype=dtype, buffer=shm.buf, offset=offset)
+        values.flags.writeable = False
+        if column in spec.categories:
+            values = pd.Categorical.from_codes(values, spec.categories[column])
+        columns[column] = values
+
+    index = pd.RangeIndex(spec.index_start, spec.index_start + spec.nrows)
+    return pd.DataFrame(columns, index=index, copy=False), shm
+
+#%%
+# Worker pool
+_worker_table = None
+
+def _init_worker(spec):
+    global _worker_table
+    _worker_table = attach_centil_table(spec)
+
+def _run_region(args):
+    func, region = args
+    df, _ = _worker_table
+    return func(df, region)
+
+def map_regions(func, shared, regions, processes=None):
+    """
+    Run func(df, region) for every region in a process pool. Each worker
+    attaches to the shared table once; func must be a module-level function.
+    """
+    with Pool(processes, initializer=_init_worker, initargs=(shared.spec,)) as pool:
+        return pool.map(_run_region, [(func, region) for region in regions])
+
+def region_totals(df, region):
+    """Example job: contributors, RTB and tax per year for one region"""
+    return df[df[ENTE] == region].groupby(ANO)[[QUANTIDADE, SOMA_RTB, IMPOSTO_DEVIDO]].sum()
@@ -0,0 +1,145 @@
+"""
+Synthetic individual-level incomes consistent with the Receita centil table.
+
+The Receita only publishes centil aggregates. Within each centil the incomes
+are drawn from a truncated exponential distribution on
+[limite superior do centil anterior, limite superior do centil], with its
+shape chosen so the mean matches Soma da RTB / Quantidade de Contribuintes.
+Sampling is stratified inverse-CDF, so counts and bounds match the table
+exactly and the per-centil sums match up to sampling noise.
+
+Records are streamed in fixed-size chunks, ordered by income, so the ~31.6M
+contributors of 2020 never have to be held in memory at once.
+
+The input must be the processed table (pipeline.load_centil_table), where
+Quantidade de Contribuintes is a head count (x1000). Limite Superior is in
+R$ and Soma da RTB in R$ milhões; incomes are generated in R$.
+"""
+import numpy as np
+import pandas as pd
+
+from utils import ANO, ENTE, CENTIL, QUANTIDADE, LIMITE_SUPERIOR, SOMA_RTB, map_x_position
+
+# Range of the exponential shape parameter searched when matching the means
+MAX_SHAPE = 500.0
+
+# Soma da RTB is in R$ milhões, Limite Superior in R$
+SOMA_RTB_TO_REAIS = 1_000_000
+
+# Relative slack for means that fall just outside their bounds by rounding
+MEAN_TOLERANCE = 1e-6
+
+def centil_bounds(df):
+    """
+    Build the per-centil sampling table (lower, upper, count, mean, all in
+    R$) for a single year/region of the processed table, ordered by x
+    position. Missing limits and sums (exempt centils) count as 0.
+    """
+    for column in [ANO, ENTE]:
+        if column in df.columns and df[column].nunique() > 1:
+            raise ValueError(f"Expected a single '{column}', got {df[column].nunique()}")
+
+    # Accept CentilIndex.group / MetricCube.group frames, indexed by Centil
+    if CENTIL not in df.columns and df.index.name == CENTIL:
+        df = df.reset_index()
+
+    bounds = df[~df[CENTIL].isin([100, 10010])].copy()
+    bounds['x_position'] = bounds[CENTIL].apply(map_x_position)
+    bounds = bounds.sort_values('x_position').reset_index(drop=True)
+
+    upper = bounds[LIMITE_SUPERIOR].fillna(0).to_numpy(dtype=float)
+    lower = np.concatenate([[0.0], upper[:-1]])
+    count = np.rint(bounds[QUANTIDADE].fillna(0).to_numpy(dtype=float)).astype(np.int64)
+    soma = bounds[SOMA_RTB].fillna(0).to_numpy(dtype=float) * SOMA_RTB_TO_REAIS
+    mean = np.divide(soma, count, out=np.zeros_like(soma), where=count > 0)
+
+    slack = MEAN_TOLERANCE * np.maximum(np.abs(upper), 1.0)
+    outside = (count > 0) & ((mean < lower - slack) | (mean > upper + slack))
+    if outside.any():
+        centils = bounds.loc[outside, CENTIL].tolist()
+        raise ValueError(f"Mean income outside the centil bounds for centils {centils}; "
+                         "is this the processed table (Quantidade x1000)?")
+
+    return pd.DataFrame({
+        CENTIL: bounds[CENTIL].to_numpy(),
+        'lower': lower,
+        'upper': upper,
+        'count': count,
+        'mean': np.clip(mean, lower, upper),
+    })
+
+def _truncated_exponential_mean(shape):
+    # Mean of the density proportional to exp(-shape * t) on [0, 1]
+    shape = np.asarray(shape, dtype=float)
+    small = np.abs(shape) < 1e-6
+    safe = np.where(small, 1.0, shape)
+    mean = 1 / safe - 1 / np.expm1(safe)
+    return np.where(small, 0.5 - shape / 12, mean)
+
+def _truncated_exponential_ppf(u, shape):
+    # Inverse CDF of the density proportional to exp(-shape * t) on [0, 1]
+    small = np.abs(shape) < 1e-6
+    safe = np.where(small, 1.0, shape)
+    t = -np.log1p(u * np.expm1(-safe)) / safe
+    return np.where(small, u, np.clip(t, 0.0, 1.0))
+
+def solve_shapes(lower, upper, mean, iterations=60):
+    """
+    Vectorized bisection for the exponential shape of every centil so that
+    the truncated distribution on [lower, upper] has the requested mean
+    """
+    width = upper - lower
+    target = np.divide(mean - lower, width, out=np.full_like(width, 0.5), where=width > 0)
+
+    low = np.full_like(target, -MAX_SHAPE)
+    high = np.full_like(target, MAX_SHAPE)
+    for _ in range(iterations):
+        mid = (low + high) / 2
+        # The mean decreases as the shape grows
+        too_high = _truncated_exponential_mean(mid) > target
+        low = np.where(too_high, mid, low)
+        high = np.where(too_high, high, mid)
+    return (low + high) / 2
+
+def generate_synthetic_incomes(df, chunk_size=1_000_000, seed=None, return_centil=False):
+    """
+    Stream synthetic incomes in R$ for a single year/region of the processed
+    table, in chunks of at most chunk_size records ordered by income.
+
+    Yields NumPy arrays, or (incomes, centils) tuples if return_centil is True.
+    """
+    bounds = centil_bounds(df)
+    lower = bounds['lower'].to_numpy()
+    width = (bounds['upper'] - bounds['lower']).to_numpy()
+    count = bounds['count'].to_numpy()
+    codes = bounds[CENTIL].to_numpy()
+    shapes = solve_shapes(lower, bounds['upper'].to_numpy(), bounds['mean'].to_numpy())
+
+    offsets = np.concatenate([[0], np.cumsum(count)])
+    total = offsets[-1]
+    rng = np.random.default_rng(seed)
+
+    for start in range(0, total, chunk_size):
+        record = np.arange(start, min(start + chunk_size, total))
+        # Centil of each record, skipping empty centils
+        group = np.searchsorted(offsets, record, side='right') - 1
+        rank = record - offsets[group]
+
+        # One uniform per stratum keeps the sample close to the exact mean
+        u = (rank + rng.random(len(record))) / count[group]
+        incomes = lower[group] + width[group] * _truncated_exponential_ppf(u, shapes[group])
+
+        if return_centil:
+            yield incomes, codes[group]
+        else:
+            yield incomes
+
+def generate_synthetic_batches(df, chunk_size=1_000_000, seed=None):
+    """
+    Same stream as generate_synthetic_incomes, as Arrow record batches with
+    'Centil' and 'Renda' columns
+    """
+    import pyarrow as pa
+
+    for incomes, centils in generate_synthetic_incomes(df, chunk_size, seed, return_centil=True):
+        yield pa.RecordBatch.from_arrays([pa.array(centils), pa.array(incomes)], names=[CENTIL, 'Renda'])
@@ -1,3 +1,15 @@
+import numpy as np
+import pandas as pd
+
+# Column names of the Receita Federal centil table
+ANO = "Ano-calendário"
+ENTE = "Ente Federativo"
+CENTIL = "Centil"
+QUANTIDADE = "Quantidade de Contribuintes"
+LIMITE_SUPERIOR = "Rendimentos Tributaveis - Limite Superior da RTB do Centil [R$ milhões]"
+SOMA_RTB = "Rendimentos Tributaveis - Soma da RTB do Centil [R$ milhões]"
+IMPOSTO_DEVIDO = "Imposto Devido [R$ milhões]"
+
 def convert_brazilian_number(value):
     """
     Convert Brazilian-formatted number string to float
@@ -11,3 +23,48 @@ def convert_brazilian_number(value):
     value = value.replace(',', '.')
     return float(value)
 
+def convert_brazilian_column(column):
+    """
+    Vectorized convert_brazilian_number for a whole Series of strings
+    """
+    column = column.str.replace('.', '', regex=False)
+    column = column.str.replace(',', '.', regex=False)
+    return column.astype(float)
+
+def map_x_position(centil):
+    if centil <= 99:
+        return centil
+    elif 1001 <= centil <= 1009:
+        return 99 + (centil - 1000) * 0.1
+    elif 100101 <= centil <= 100110:
+        return 99.9 + (centil - 100100) * 0.01
+    elif centil == 1001010:
+        return 100
+    return centil
+
+def map_width(centil):
+    std_width = 2.0
+    if centil <= 99:
+        return std_width
+    elif 1001 <= centil <= 1009:
+        return std_width / 2
+    elif 100101 <= centil:
+        return std_width / 2
+    return std_width
+
+def pivot_groups(df, columns):
+    """
+    Lay out every (Ano-calendário[, Ente Federativo]) group as a row of
+    (group x centil) arrays ordered by x position, 0 where a centil is missing.
+    Returns the group keys, the x positions and one array per column.
+    """
+    keys = [ANO] if ENTE not in df.columns else [ANO, ENTE]
+    df = df.copy()
+    if 'x_position' not in df.columns:
+        df['x_position'] = df[CENTIL].apply(map_x_position)
+
+    wide = df.pivot_table(index=keys, columns='x_position', values=columns, aggfunc='sum', fill_value=0)
+    wide = wide.sort_index(axis=1)
+    groups = wide.index.to_frame(index=False)
+    positions = wide[columns[0]].columns.to_numpy(dtype=float)
+    return groups, positions, {column: wide[column].to_numpy(dtype=float) for column in columns}